@@ -1,18 +1,70 @@
 """Event and attachment dataclasses for CESR parsing."""
 
+import functools
 from dataclasses import dataclass, field
 from typing import Any
 
-
-@dataclass
+import orjson
+
+# Human-readable labels for KERI/ACDC event types
+_EVENT_TYPE_LABELS = {
+    "icp": "Inception",
+    "rot": "Rotation",
+    "ixn": "Interaction",
+    "dip": "Delegated Inception",
+    "drt": "Delegated Rotation",
+    "rct": "Receipt",
+    "qry": "Query",
+    "rpy": "Reply",
+    "pro": "Prod",
+    "bar": "Bare",
+    "exn": "Exchange",
+    "vcp": "VC Registry Inception",
+    "vrt": "VC Registry Rotation",
+    "iss": "VC Issuance",
+    "rev": "VC Revocation",
+    "bis": "Backer VC Issuance",
+    "brv": "Backer VC Revocation",
+}
+
+
+# The KERI `t` field has ~15 distinct values and a whole KEL usually covers a
+# single AID, so these derived strings repeat across thousands of events —
+# memoize them rather than re-deriving (and re-allocating) per event.
+@functools.lru_cache(maxsize=64)
+def _format_type_label(t: str) -> str:
+    """Human-readable label for an event type code."""
+    return _EVENT_TYPE_LABELS.get(t, t.upper())
+
+
+@functools.lru_cache(maxsize=64)
+def _short_identifier(i: str) -> str:
+    """Truncated identifier for display."""
+    return f"{i[:16]}..." if len(i) > 16 else i
+
+
+@dataclass(slots=True)
 class Attachment:
     """Represents a CESR attachment (signatures, receipts, etc.)."""
 
     code: str  # The CESR counter code (e.g., "-A")
     count: int  # Number of items
     name: str  # Human-readable name
-    raw: str  # Raw CESR-encoded data
-    materials: list[dict] = field(default_factory=list)  # Parsed materials
+    materials: list[dict]  # Parsed materials
+
+    # Source stream and bounds; `raw` is decoded lazily since most
+    # attachments are never expanded in the UI
+    _data: bytes = b""
+    _start: int = 0
+    _end: int = 0
+    _raw: str | None = field(default=None, repr=False)
+
+    @property
+    def raw(self) -> str:
+        """Raw CESR-encoded data, decoded from the stream on first access."""
+        if self._raw is None:
+            self._raw = self._data[self._start : self._end].decode("utf-8", errors="replace")
+        return self._raw
 
     @property
     def type_label(self) -> str:
@@ -20,127 +72,87 @@ class Attachment:
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
-    """Represents a KERI event extracted from a CESR stream."""
+    """Represents a KERI event extracted from a CESR stream.
+
+    Display fields are derived once at construction rather than exposed as
+    properties — templates read them repeatedly per render, so eager fixed
+    attributes keep the hot render path to plain slot lookups.
+    """
 
     raw: str  # Raw JSON string
     data: dict[str, Any]  # Parsed JSON data
-    attachments: list[Attachment] = field(default_factory=list)
-
-    @property
-    def version(self) -> str:
-        """Event version string."""
-        return self.data.get("v", "")
-
-    @property
-    def type(self) -> str:
-        """Event type (icp, rot, ixn, dip, drt, etc.)."""
-        return self.data.get("t", "")
-
-    @property
-    def digest(self) -> str:
-        """Event SAID/digest."""
-        return self.data.get("d", "")
-
-    @property
-    def identifier(self) -> str:
-        """AID/identifier for this event."""
-        return self.data.get("i", "")
-
-    @property
-    def sequence(self) -> int:
-        """Sequence number as integer."""
-        s = self.data.get("s", 0)
+    attachments: list[Attachment]  # Always provided by the parser; no per-event factory call
+
+    # Position in the owning collection (assigned by the web layer once per
+    # load so groupings don't need an id()-keyed lookup); -1 = unassigned
+    _idx: int = field(default=-1, init=False, repr=False)
+    _pretty_json: str | None = field(default=None, init=False, repr=False)
+
+    # Derived at construction from `data`
+    version: str = field(init=False)
+    type: str = field(init=False)
+    digest: str = field(init=False)
+    identifier: str = field(init=False)
+    sequence: int = field(init=False)
+    sequence_hex: str = field(init=False)
+    prior: str = field(init=False)
+    anchors: list[dict] = field(init=False)
+    protocol: str = field(init=False)
+    cesr_version: str = field(init=False)
+    cesr_major_version: str = field(init=False)
+    serialization: str = field(init=False)
+    short_digest: str = field(init=False)
+    short_identifier: str = field(init=False)
+    type_label: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        data = self.data
+        self.version = v = data.get("v", "")
+        self.type = t = data.get("t", "")
+        self.digest = d = data.get("d", "")
+        self.identifier = i = data.get("i", "")
+
+        # Sequence number (KERI uses hex strings)
+        s = data.get("s", 0)
         if isinstance(s, int):
-            return s
-        # Fallback for string (KERI uses hex strings)
-        try:
-            return int(s, 16)
-        except ValueError:
-            return 0
-
-    @property
-    def sequence_hex(self) -> str:
-        """Sequence number as hex string."""
-        s = self.data.get("s", 0)
-        if isinstance(s, int):
-            return format(s, "x")
-        return str(s)
-
-    @property
-    def prior(self) -> str:
-        """Prior event digest."""
-        return self.data.get("p", "")
-
-    @property
-    def anchors(self) -> list[dict]:
-        """Anchor seals if present."""
-        return self.data.get("a", [])
-
-    @property
-    def type_label(self) -> str:
-        """Human-readable event type label."""
-        labels = {
-            "icp": "Inception",
-            "rot": "Rotation",
-            "ixn": "Interaction",
-            "dip": "Delegated Inception",
-            "drt": "Delegated Rotation",
-            "rct": "Receipt",
-            "qry": "Query",
-            "rpy": "Reply",
-            "pro": "Prod",
-            "bar": "Bare",
-            "exn": "Exchange",
-            "vcp": "VC Registry Inception",
-            "vrt": "VC Registry Rotation",
-            "iss": "VC Issuance",
-            "rev": "VC Revocation",
-            "bis": "Backer VC Issuance",
-            "brv": "Backer VC Revocation",
-        }
-        return labels.get(self.type, self.type.upper())
-
-    @property
-    def short_digest(self) -> str:
-        """Truncated digest for display."""
-        d = self.digest
-        return f"{d[:12]}..." if len(d) > 12 else d
-
-    @property
-    def short_identifier(self) -> str:
-        """Truncated identifier for display."""
-        i = self.identifier
-        return f"{i[:16]}..." if len(i) > 16 else i
-
-    @property
-    def protocol(self) -> str:
-        """Protocol identifier (KERI, ACDC, etc.)."""
-        v = self.version
-        return v[:4] if len(v) >= 4 else ""
-
-    @property
-    def cesr_version(self) -> str:
-        """CESR version as 'major.minor' (e.g., '1.0', '2.0')."""
-        v = self.version
-        if len(v) >= 6:
-            major = v[4:5]
-            minor = v[5:6]
-            return f"{major}.{minor}"
-        return ""
-
-    @property
-    def cesr_major_version(self) -> str:
-        """CESR major version number (e.g., '1', '2')."""
-        v = self.version
-        return v[4:5] if len(v) >= 5 else ""
-
-    @property
-    def serialization(self) -> str:
-        """Serialization format (JSON, CBOR, MGPK)."""
-        v = self.version
-        return v[6:10] if len(v) >= 10 else ""
+            self.sequence = s
+            self.sequence_hex = format(s, "x")
+        else:
+            try:
+                self.sequence = int(s, 16)
+            except ValueError:
+                self.sequence = 0
+            self.sequence_hex = str(s)
+
+        self.prior = data.get("p", "")
+        self.anchors = data.get("a", [])
+
+        # Version string fields: protocol (KERI, ACDC), CESR version,
+        # serialization format (JSON, CBOR, MGPK)
+        self.protocol = v[:4] if len(v) >= 4 else ""
+        self.cesr_version = f"{v[4]}.{v[5]}" if len(v) >= 6 else ""
+        self.cesr_major_version = v[4:5] if len(v) >= 5 else ""
+        self.serialization = v[6:10] if len(v) >= 10 else ""
+
+        # Truncated forms for display; digests are unique per event so the
+        # short digest is derived inline rather than through the caches
+        self.short_digest = f"{d[:12]}..." if len(d) > 12 else d
+        self.short_identifier = _short_identifier(i)
+
+        self.type_label = _format_type_label(t)
+
+    @property
+    def pretty_json(self) -> str:
+        """Pretty-printed event JSON, serialized once and cached.
+
+        The detail view re-renders the same event on every selection;
+        caching avoids re-serializing identical output per request.
+        """
+        if self._pretty_json is None:
+            self._pretty_json = orjson.dumps(self.data, option=orjson.OPT_INDENT_2).decode()
+        return self._pretty_json
 
     @property
     def raw_cesr(self) -> str:
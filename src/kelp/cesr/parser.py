@@ -1,12 +1,90 @@
 """CESR stream parser using keripy for proper CESR 1.0 parsing."""
 
-from keri.core.coring import Matter, Seqner
-from keri.core.counting import Counter
-from keri.core.indexing import Siger
-from keri.core.serdering import Serder
+import functools
+import re
+from collections import namedtuple
+
+import orjson
 
 from .events import Attachment, Event
 
+# keripy pulls in libsodium bindings, blake3, and a large config cascade at
+# import time — defer it to first use so importing kelp stays cheap
+_KeriCore = namedtuple("_KeriCore", ["Matter", "Seqner", "Counter", "Siger", "Serder"])
+_KERI: _KeriCore | None = None
+
+
+def _load_keri() -> _KeriCore:
+    """Import the keripy primitives once, on first use."""
+    global _KERI
+    if _KERI is None:
+        from keri.core.coring import Matter, Seqner
+        from keri.core.counting import Counter
+        from keri.core.indexing import Siger
+        from keri.core.serdering import Serder
+
+        _KERI = _KeriCore(Matter, Seqner, Counter, Siger, Serder)
+    return _KERI
+
+
+# KERI version string, e.g. KERI10JSON0000fc_ — group 5 is the event size in hex
+_VER_RE = re.compile(rb'"v":"([A-Z]{4})([0-9a-f])([0-9a-f])([A-Z]{4})([0-9a-f]{6})_"')
+
+
+def _event_size_at(data: bytes, offset: int) -> int | None:
+    """Return the event size if a KERI JSON version string sits near offset."""
+    match = _VER_RE.search(data, offset, offset + 128)
+    return int(match.group(5), 16) if match else None
+
+
+def _next_event_start(data, pos: int) -> int:
+    """Advance from the top-level event start at `pos` to the next one.
+
+    Reads the event's size from its version string, skips the body, then
+    finds the next '{' past the attachment run — attachments are pure
+    qb64/counter material and cannot contain '{', so that offset is a
+    guaranteed top-level start. Searching for the version tag instead would
+    also match events embedded inside another event's payload (e.g. an exn).
+
+    Returns -1 when the walk cannot be confirmed: unreadable version string,
+    body extending past the end of `data`, or no further '{'.
+    """
+    size = _event_size_at(data, pos)
+    if size is None or pos + size > len(data):
+        return -1
+    return data.find(b"{", pos + size)
+
+
+def _find_material_end(data: bytes, start: int) -> int:
+    """Scan from `start` to the end of a run of raw CESR material.
+
+    Returns the offset of the next event start ('{') or counter code,
+    or len(data) if the material runs to the end of the stream. The scan
+    jumps between candidate boundaries with bytes.find (memchr under the
+    hood) rather than stepping per byte.
+    """
+    current = start
+    while current < len(data):
+        next_brace = data.find(b"{", current)
+        next_dash = data.find(b"-", current)
+        if next_brace < 0:
+            next_brace = len(data)
+        if next_dash < 0:
+            next_dash = len(data)
+        boundary = min(next_brace, next_dash)
+        if boundary >= len(data):
+            return len(data)
+        current = boundary
+        if boundary == next_brace:
+            return current
+        # Check if the dash starts a well-formed counter before handing the
+        # run boundary back to the attachment parser
+        if _counter_starts_at(data, current):
+            return current
+        current += 1
+    return current
+
+
 # Counter code names from CESR 1.0 spec
 COUNTER_NAMES = {
     "-A": "Controller Indexed Sigs",
@@ -26,6 +104,59 @@ COUNTER_NAMES = {
     "-Z": "ESSR Payload Group",
 }
 
+# Byte forms of the known counter codes, for cheap probes while scanning
+_KNOWN_COUNTER_CODES = frozenset(code.encode() for code in COUNTER_NAMES)
+
+# Shape of a CESR 1.0 counter quadlet: dash, code char, two base64 count chars.
+# Matching this before constructing a Counter keeps malformed candidates from
+# round-tripping through keripy's exception machinery.
+_COUNTER_PROBE = re.compile(rb"-[A-Z][A-Za-z0-9_-]{2}")
+
+# Big counter codes (-0V etc., five count chars) and the genus code (--AAA)
+# carry a second selector char and span 8 qb64 chars in total
+_BIG_COUNTER_PROBE = re.compile(rb"-[0-][A-Za-z0-9_-]{6}")
+
+
+def _counter_starts_at(data: bytes, offset: int) -> bool:
+    """Cheap probe: does a plausible counter code start at this offset?
+
+    An O(1) set/prefix check plus an anchored regex, so the scanners only
+    pay for a Counter construction on shapes keripy can actually accept.
+    """
+    prefix = data[offset : offset + 2]
+    if prefix in _KNOWN_COUNTER_CODES:
+        return _COUNTER_PROBE.match(data, offset) is not None
+    if prefix in (b"-0", b"--"):
+        return _BIG_COUNTER_PROBE.match(data, offset) is not None
+    return False
+
+
+# 256-entry table: is this byte valid CESR primitive material (base64url)?
+# Indexing by int byte replaces a 1-byte slice + isalnum() call per probe.
+_CESR_CHAR_OK = tuple(bytes([c]).isalnum() or c in b"-_" for c in range(256))
+
+# Integer byte values for boundary tests — data[i] returns an int, so
+# comparing against these avoids allocating a 1-byte slice per check
+_LBRACE = ord("{")
+_DASH = ord("-")
+_WS = frozenset(b" \t\n\r")
+
+
+# The same handful of counter prefixes and small sequence numbers repeat for
+# every event in a KEL; keripy objects are immutable after construction, so
+# memoizing them on their fixed-width qb64 prefix is safe.
+@functools.lru_cache(maxsize=1024)
+def _cached_counter(qb64b: bytes):
+    """Construct (or reuse) a Counter from its 8-byte qb64 prefix."""
+    return _load_keri().Counter(qb64b=qb64b, strip=False)
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_seqner(qb64b: bytes):
+    """Construct (or reuse) a Seqner from its 24-char qb64 form."""
+    return _load_keri().Seqner(qb64b=qb64b, strip=False)
+
+
 # Signature code to algorithm name mapping
 # Indexed signatures (from keripy IdrDex)
 SIG_ALGORITHM_NAMES = {
@@ -57,9 +188,14 @@ class CESRParser:
 
     def __init__(self):
         self.events: list[Event] = []
+        self._buf = bytearray()  # carry-over between parse_incremental calls
 
     def parse(self, data: bytes | str) -> list[Event]:
-        """Parse a CESR stream and extract all events with attachments."""
+        """Parse a CESR stream and extract all events with attachments.
+
+        `data` may be any bytes-like object with `find` (bytes, bytearray,
+        mmap) — only the slices an event actually needs are copied out.
+        """
         if isinstance(data, str):
             data = data.encode("utf-8")
 
@@ -67,22 +203,31 @@ class CESRParser:
         offset = 0
 
         while offset < len(data):
-            # Skip whitespace
-            while offset < len(data) and data[offset : offset + 1] in b" \t\n\r":
-                offset += 1
-
-            if offset >= len(data):
+            # Jump straight to the next candidate event start; bytes.find is a
+            # C-level scan, so this also skips whitespace and junk in one step
+            offset = data.find(b"{", offset)
+            if offset < 0:
                 break
 
-            # Look for JSON start
-            if data[offset : offset + 1] != b"{":
-                offset += 1
-                continue
+            # Validate the version string before committing to a parse so bad
+            # candidates are rejected without raising through the except below
+            event_size = _event_size_at(data, offset)
 
             try:
-                # Parse as a KERI event using Serder
-                serder = Serder(raw=data[offset:], strip=False)
-                event_size = serder.size
+                # Fast path: read the event size from the KERI version string and
+                # parse the JSON directly — no Serder validation needed for browsing
+                if event_size is not None:
+                    sad = orjson.loads(data[offset : offset + event_size])
+                else:
+                    # No recognizable version field at all: plain junk, move on
+                    # without paying for a Serder construction and its exception
+                    if data[offset : offset + 6] != b'{"v":"':
+                        offset += 1
+                        continue
+                    # Unrecognized version string: let keripy work out the size
+                    serder = _load_keri().Serder(raw=data[offset:], strip=False)
+                    event_size = serder.size
+                    sad = serder.sad
 
                 # Extract raw JSON
                 raw_json = data[offset : offset + event_size].decode("utf-8")
@@ -93,7 +238,7 @@ class CESRParser:
 
                 event = Event(
                     raw=raw_json,
-                    data=serder.sad,
+                    data=sad,
                     attachments=attachments,
                 )
                 self.events.append(event)
@@ -101,11 +246,46 @@ class CESRParser:
                 offset = attach_end
 
             except Exception:
-                # Not a valid event at this position, skip ahead
+                # Not a valid event at this position; resync at the next candidate
                 offset += 1
 
         return self.events
 
+    def parse_incremental(self, chunk: bytes) -> list[Event]:
+        """Feed a chunk of a CESR stream and return the events completed by it.
+
+        Events are only emitted once the next event boundary has been seen,
+        since an event's attachments can span chunks. Call `finalize()` after
+        the last chunk to flush the trailing event.
+        """
+        self._buf.extend(chunk)
+        buf = self._buf
+        # Hold back everything from the last top-level event start onward —
+        # its attachments may still be arriving. The start is found by
+        # size-walking events from the front of the buffer; rfind on the
+        # version tag could land on an event embedded in another's payload
+        # and cut the outer event in half. The buffer only ever holds the
+        # trailing unconfirmed event, so the walk is short.
+        start = buf.find(b'{"v":"')
+        if start < 0:
+            return []
+        boundary = start
+        while (nxt := _next_event_start(buf, boundary)) >= 0:
+            boundary = nxt
+        if boundary <= 0:
+            return []
+        events = self.parse(bytes(buf[:boundary]))
+        del buf[:boundary]
+        return events
+
+    def finalize(self) -> list[Event]:
+        """Flush and parse whatever remains after the final chunk."""
+        if not self._buf:
+            return []
+        events = self.parse(bytes(self._buf))
+        self._buf.clear()
+        return events
+
     def _parse_attachments(self, data: bytes, offset: int) -> tuple[list[Attachment], int]:
         """Parse attachments following an event using keripy Counter."""
         attachments = []
@@ -113,20 +293,27 @@ class CESRParser:
 
         while current < len(data):
             # Skip whitespace
-            while current < len(data) and data[current : current + 1] in b" \t\n\r":
+            while current < len(data) and data[current] in _WS:
                 current += 1
 
             if current >= len(data):
                 break
 
+            char = data[current]
+
             # Check if we hit a new event (starts with '{')
-            if data[current : current + 1] == b"{":
+            if char == _LBRACE:
                 break
 
             # Try to parse a counter code
-            if data[current : current + 1] == b"-":
+            if char == _DASH:
+                # Reject unknown codes and malformed count chars up front
+                # rather than letting Counter raise
+                if not _counter_starts_at(data, current):
+                    current += 1
+                    continue
                 try:
-                    counter = Counter(qb64b=data[current:], strip=False)
+                    counter = _cached_counter(data[current : current + 8])
                     code = counter.code
                     count = counter.count
                     counter_size = counter.fullSize
@@ -140,15 +327,15 @@ class CESRParser:
                     # Get human-readable name
                     name = COUNTER_NAMES.get(code, f"Counter {code}")
 
-                    raw_attachment = data[current:material_end].decode("utf-8", errors="replace")
-
                     attachments.append(
                         Attachment(
                             code=code,
                             count=count,
                             name=name,
-                            raw=raw_attachment,
                             materials=materials,
+                            _data=data,
+                            _start=current,
+                            _end=material_end,
                         )
                     )
 
@@ -159,34 +346,23 @@ class CESRParser:
                     current += 1
             else:
                 # Not a counter, check if it's CESR primitive material
-                char = data[current : current + 1]
-                if char and (char[0:1].isalnum() or char in b"-_"):
+                if _CESR_CHAR_OK[data[current]]:
                     # Collect raw CESR primitives until next event or counter
                     raw_start = current
-                    while current < len(data):
-                        if data[current : current + 1] == b"{":
-                            break
-                        if data[current : current + 1] == b"-":
-                            # Check if it looks like a counter
-                            try:
-                                Counter(qb64b=data[current:], strip=False)
-                                break  # It's a valid counter, stop here
-                            except Exception:
-                                pass
-                        current += 1
-
-                    if current > raw_start:
-                        raw = data[raw_start:current].decode("utf-8", errors="replace")
-                        if raw.strip():
-                            attachments.append(
-                                Attachment(
-                                    code="RAW",
-                                    count=0,
-                                    name="Raw CESR Material",
-                                    raw=raw,
-                                    materials=[],
-                                )
+                    current = _find_material_end(data, current)
+
+                    if current > raw_start and data[raw_start:current].strip():
+                        attachments.append(
+                            Attachment(
+                                code="RAW",
+                                count=0,
+                                name="Raw CESR Material",
+                                materials=[],
+                                _data=data,
+                                _start=raw_start,
+                                _end=current,
                             )
+                        )
                 else:
                     break
 
@@ -196,17 +372,24 @@ class CESRParser:
         self, data: bytes, offset: int, code: str, count: int
     ) -> tuple[list[dict], int]:
         """Extract the material following a counter code."""
+        keri = _load_keri()
         materials = []
         current = offset
 
         try:
             if code in ("-A", "-B"):  # Indexed Sigs (Controller or Witness)
-                for _ in range(count):
-                    if current >= len(data):
-                        break
-                    siger = Siger(qb64b=data[current:], strip=False)
-                    materials.append(
-                        {
+                # Hottest loop in a KEL — every event carries controller sigs.
+                # Preallocate the result list and bound each qb64 slice (no
+                # indexed sig exceeds 160 chars) so keripy never copies the
+                # whole stream tail per signature.
+                materials = [None] * count
+                filled = 0
+                try:
+                    for k in range(count):
+                        if current >= len(data):
+                            break
+                        siger = keri.Siger(qb64b=data[current : current + 160], strip=False)
+                        materials[k] = {
                             "type": "indexed_sig",
                             "index": siger.index,
                             "ondex": getattr(siger, "ondex", None),
@@ -214,18 +397,22 @@ class CESRParser:
                             "algorithm": SIG_ALGORITHM_NAMES.get(siger.code, siger.code),
                             "qb64": siger.qb64,
                         }
-                    )
-                    current += len(siger.qb64)
+                        filled += 1
+                        current += siger.fullSize
+                finally:
+                    # Truncate even when Siger raises mid-loop so the
+                    # "return what we have" path never yields None entries
+                    del materials[filled:]
 
             elif code == "-C":  # Nontransferable Receipt Couples
                 for _ in range(count):
                     if current >= len(data):
                         break
                     # Couple: prefixer + cigar
-                    prefixer = Matter(qb64b=data[current:], strip=False)
-                    current += len(prefixer.qb64)
-                    cigar = Matter(qb64b=data[current:], strip=False)
-                    current += len(cigar.qb64)
+                    prefixer = keri.Matter(qb64b=data[current:], strip=False)
+                    current += prefixer.fullSize
+                    cigar = keri.Matter(qb64b=data[current:], strip=False)
+                    current += cigar.fullSize
                     materials.append(
                         {
                             "type": "receipt_couple",
@@ -241,10 +428,10 @@ class CESRParser:
                     if current >= len(data):
                         break
                     # Couple: seqner + saider
-                    seqner = Seqner(qb64b=data[current:], strip=False)
-                    current += len(seqner.qb64)
-                    saider = Matter(qb64b=data[current:], strip=False)
-                    current += len(saider.qb64)
+                    seqner = _cached_seqner(data[current : current + 24])
+                    current += seqner.fullSize
+                    saider = keri.Matter(qb64b=data[current:], strip=False)
+                    current += saider.fullSize
                     materials.append(
                         {
                             "type": "seal_source",
@@ -258,10 +445,10 @@ class CESRParser:
                     if current >= len(data):
                         break
                     # Couple: seqner + dater
-                    seqner = Seqner(qb64b=data[current:], strip=False)
-                    current += len(seqner.qb64)
-                    dater = Matter(qb64b=data[current:], strip=False)
-                    current += len(dater.qb64)
+                    seqner = _cached_seqner(data[current : current + 24])
+                    current += seqner.fullSize
+                    dater = keri.Matter(qb64b=data[current:], strip=False)
+                    current += dater.fullSize
                     materials.append(
                         {
                             "type": "first_seen",
@@ -277,7 +464,7 @@ class CESRParser:
                     if current >= len(data):
                         break
                     try:
-                        matter = Matter(qb64b=data[current:], strip=False)
+                        matter = keri.Matter(qb64b=data[current:], strip=False)
                         materials.append(
                             {
                                 "type": "matter",
@@ -285,7 +472,7 @@ class CESRParser:
                                 "qb64": matter.qb64,
                             }
                         )
-                        current += len(matter.qb64)
+                        current += matter.fullSize
                     except Exception:
                         break
 
@@ -1,6 +1,19 @@
 """Data sources for KEL Browser."""
 
+from typing import TYPE_CHECKING
+
 from .base import DataSource
-from .oobi import OOBISource
+
+if TYPE_CHECKING:
+    from .oobi import OOBISource
 
 __all__ = ["DataSource", "OOBISource"]
+
+
+def __getattr__(name: str):
+    # OOBISource drags in httpx and the CESR parser; import on demand
+    if name == "OOBISource":
+        from .oobi import OOBISource
+
+        return OOBISource
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,15 +2,20 @@
 
 import re
 from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
-import httpx
+if TYPE_CHECKING:
+    import httpx
 
 from kelp.cesr.events import Event
 from kelp.cesr.parser import CESRParser
 
 from .base import DataSource
 
+# OOBI URLs typically have format: /oobi/{aid}/... or /oobi/{aid}
+_OOBI_AID_RE = re.compile(r"/oobi/([A-Za-z0-9_-]{44})")
+
 
 class OOBISource(DataSource):
     """Data source that loades KELs via OOBI endpoints."""
@@ -30,11 +35,8 @@ class OOBISource(DataSource):
 
     def _extract_aid(self, url: str) -> str | None:
         """Extract the AID from an OOBI URL."""
-        # OOBI URLs typically have format: /oobi/{aid}/... or /oobi/{aid}
-        match = re.search(r"/oobi/([A-Za-z0-9_-]{44})", url)
-        if match:
-            return match.group(1)
-        return None
+        match = _OOBI_AID_RE.search(url)
+        return match.group(1) if match else None
 
     @property
     def identifier(self) -> str | None:
@@ -50,9 +52,11 @@ class OOBISource(DataSource):
             return f"OOBI: {host} ({self._aid[:16]}...)"
         return f"OOBI: {host}"
 
-    async def _get_client(self) -> httpx.AsyncClient:
+    async def _get_client(self) -> "httpx.AsyncClient":
         """Get or create the HTTP client."""
         if self._client is None:
+            import httpx  # deferred: not needed until the first request
+
             self._client = httpx.AsyncClient(timeout=self.timeout)
         return self._client
 
@@ -66,33 +70,14 @@ class OOBISource(DataSource):
         Returns:
             List of Event objects
         """
-        client = await self._get_client()
-
-        try:
-            response = await client.get(self.oobi_url)
-            response.raise_for_status()
-
-            # Parse the CESR response
-            data = response.content
-            events = self._parser.parse(data)
-
-            # Filter by identifier if explicitly specified
-            if identifier:
-                events = [e for e in events if e.identifier == identifier]
-
-            return events
-
-        except httpx.HTTPStatusError as e:
-            raise OOBILoadError(f"HTTP error loading OOBI: {e.response.status_code}") from e
-        except httpx.RequestError as e:
-            raise OOBILoadError(f"Request error loading OOBI: {e}") from e
+        return [event async for event in self.stream_events(identifier)]
 
     async def stream_events(self, identifier: str | None = None) -> AsyncIterator[Event]:
-        """Stream events as they are parsed.
+        """Stream events as the response body arrives.
 
-        Note: For HTTP OOBI, this is not truly streaming - we load all
-        data first, then yield events. True streaming would require SSE
-        or WebSocket support.
+        The body is fed to the parser chunk by chunk, so parsing overlaps
+        with the network transfer and only the unparsed tail is buffered
+        rather than the whole KEL.
 
         Args:
             identifier: Optional AID to filter events
@@ -100,9 +85,26 @@ class OOBISource(DataSource):
         Yields:
             Event objects
         """
-        events = await self.load_events(identifier)
-        for event in events:
-            yield event
+        import httpx  # cheap after _get_client has loaded it once
+
+        client = await self._get_client()
+        parser = CESRParser()
+
+        try:
+            async with client.stream("GET", self.oobi_url) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes():
+                    for event in parser.parse_incremental(chunk):
+                        if identifier is None or event.identifier == identifier:
+                            yield event
+            for event in parser.finalize():
+                if identifier is None or event.identifier == identifier:
+                    yield event
+
+        except httpx.HTTPStatusError as e:
+            raise OOBILoadError(f"HTTP error loading OOBI: {e.response.status_code}") from e
+        except httpx.RequestError as e:
+            raise OOBILoadError(f"Request error loading OOBI: {e}") from e
 
     async def close(self) -> None:
         """Close the HTTP client."""
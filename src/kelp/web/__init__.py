@@ -1,5 +1,13 @@
 """KELP Web UI."""
 
-from .main import app, create_app
-
 __all__ = ["app", "create_app"]
+
+
+def __getattr__(name: str):
+    # Importing .main pulls in FastAPI and the template stack; defer until
+    # uvicorn (or another caller) actually asks for the app
+    if name in __all__:
+        from . import main
+
+        return getattr(main, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
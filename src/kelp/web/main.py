@@ -1,12 +1,25 @@
 """FastAPI application for KELP web UI."""
 
-import json
+import asyncio
+import functools
 import subprocess
 import uuid
+from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
 from urllib.parse import unquote, urlparse
 
+import jinja2
+import orjson
+from fastapi import FastAPI, File, Form, Query, Request, UploadFile
+from fastapi.responses import HTMLResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from starlette.middleware.gzip import GZipMiddleware
+
+from kelp.cesr.parser import CESRParser
+from kelp.sources.oobi import OOBILoadError, OOBISource
+
 
 def _get_cache_version() -> str:
     """Get a cache-busting version string from git commit or fallback to timestamp."""
@@ -27,16 +40,8 @@ def _get_cache_version() -> str:
         return str(int(css_path.stat().st_mtime))
     return "1"
 
-from fastapi import FastAPI, File, Form, Query, Request, UploadFile
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 
-from kelp.cesr.parser import CESRParser
-from kelp.sources.oobi import OOBILoadError, OOBISource
-
-
-@dataclass
+@dataclass(slots=True)
 class TabState:
     """State for a single tab."""
 
@@ -49,22 +54,37 @@ class TabState:
     show_all_aids: bool = False
     url_aid: str | None = None
     is_upload: bool = False  # Track if this tab loaded from file upload
+    # AID groupings and type index precomputed when events load
+    events_by_aid_all: dict = field(default_factory=dict)
+    events_by_aid_filtered: dict = field(default_factory=dict)
+    events_by_type: dict = field(default_factory=dict)
+    _display_cache: list | None = field(default=None, repr=False)
+    _ctx_cache: dict | None = field(default=None, repr=False)
+
+    def invalidate_caches(self) -> None:
+        """Drop memoized per-tab views after any state mutation."""
+        self._display_cache = None
+        self._ctx_cache = None
 
     @property
     def max_sequence(self) -> int | None:
-        """Get the maximum sequence number from events."""
-        if not self.events:
-            return None
-        return max(e.sequence for e in self.events)
+        """Get the maximum sequence number from events.
+
+        events is kept sequence-sorted at load time, so this is the last one.
+        """
+        return self.events[-1].sequence if self.events else None
 
 
-@dataclass
+@dataclass(slots=True)
 class AppState:
     """Global application state managing multiple tabs."""
 
     tabs: dict[str, TabState] = field(default_factory=dict)
     active_tab_id: str | None = None
     tab_order: list[str] = field(default_factory=list)
+    # Ordered TabState list kept in lockstep with tab_order so context builds
+    # don't rebuild it per request
+    _ordered_tabs: list[TabState] = field(default_factory=list, repr=False)
 
     def get_active_tab(self) -> TabState | None:
         """Get the currently active tab."""
@@ -78,6 +98,7 @@ class AppState:
         tab = TabState(id=tab_id, name=name, is_upload=False)
         self.tabs[tab_id] = tab
         self.tab_order.append(tab_id)
+        self._ordered_tabs.append(tab)
         self.active_tab_id = tab_id
         return tab
 
@@ -97,12 +118,17 @@ class AppState:
             tab.is_witness = False
             tab.show_all_aids = False
             tab.url_aid = None
+            tab.events_by_aid_all = {}
+            tab.events_by_aid_filtered = {}
+            tab.events_by_type = {}
+            tab.invalidate_caches()
             return self.active_tab_id
 
         # Find adjacent tab to switch to
         idx = self.tab_order.index(tab_id)
         del self.tabs[tab_id]
         self.tab_order.remove(tab_id)
+        self._ordered_tabs = [t for t in self._ordered_tabs if t.id != tab_id]
 
         # Switch to previous tab, or first if closing first tab
         new_idx = max(0, idx - 1)
@@ -111,7 +137,7 @@ class AppState:
 
     def get_tabs_in_order(self) -> list[TabState]:
         """Get tabs in display order."""
-        return [self.tabs[tid] for tid in self.tab_order if tid in self.tabs]
+        return self._ordered_tabs
 
 
 def _tab_name_from_url(url: str) -> str:
@@ -125,11 +151,20 @@ def _tab_name_from_url(url: str) -> str:
     return "New Tab"
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_jq(jq_expr: str):
+    """Compile a jq program once per distinct expression."""
+    import jq  # deferred: only loaded when a filter is actually used
+
+    return jq.compile(jq_expr)
+
+
 def jq_filter_match(jq_expr: str, data: dict) -> bool:
     """Check if data matches a jq filter expression.
 
-    Converts the 's' (sequence) field from hex string to integer
-    for easier filtering (e.g., select(.s > 5) just works).
+    Runs in-process via libjq — no subprocess fork or JSON round trip
+    per event. Converts the 's' (sequence) field from hex string to
+    integer for easier filtering (e.g., select(.s > 5) just works).
     """
     # Create a copy with .s converted from hex to int for filtering
     filter_data = data.copy()
@@ -140,17 +175,31 @@ def jq_filter_match(jq_expr: str, data: dict) -> bool:
             pass  # Keep original if conversion fails
 
     try:
-        result = subprocess.run(
-            ["jq", "-e", jq_expr],
-            input=json.dumps(filter_data),
-            capture_output=True,
-            text=True,
-            timeout=1,
-        )
-        # -e flag makes jq exit with 1 if result is false/null
-        return result.returncode == 0
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return False
+        result = _compile_jq(jq_expr).input(filter_data).first()
+        # Match jq -e semantics: only null and false are non-matches, so
+        # falsy-but-valid outputs (0, "", []) still count as hits
+        return result is not None and result is not False
+    except StopIteration:
+        return False  # filter produced no output (e.g. select() mismatch)
+    except Exception:
+        return False  # invalid expression or runtime error
+
+
+# Pluralized group labels for events without an identifier, keyed by type
+# label ("Reply" -> "Replies"). The handful of distinct labels repeat across
+# every grouping pass, so build each plural once
+_LABEL_AID_CACHE: dict[str, str] = {}
+
+
+def _plural_label(label: str) -> str:
+    """Pluralized form of a type label, memoized across grouping passes."""
+    aid = _LABEL_AID_CACHE.get(label)
+    if aid is None:
+        # Handle irregular plurals
+        aid = f"{label[:-1]}ies" if label.endswith("y") else f"{label}s"
+        _LABEL_AID_CACHE[label] = aid
+    return aid
+
 
 # File upload settings
 MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
@@ -160,447 +209,586 @@ WEB_DIR = Path(__file__).parent
 TEMPLATES_DIR = WEB_DIR / "templates"
 STATIC_DIR = WEB_DIR / "static"
 
+# Every template the app renders; pre-warmed at startup so no request pays
+# for compilation
+TEMPLATE_NAMES = (
+    "base.html",
+    "index.html",
+    "partials/error.html",
+    "partials/event_detail.html",
+    "partials/event_list.html",
+    "partials/main_content.html",
+    "partials/main_content_with_tab_bar.html",
+    "partials/tab_bar.html",
+    "partials/tab_content.html",
+)
+
+
+def _render(request: Request, name: str, context: dict) -> HTMLResponse:
+    """Render a pre-compiled template straight into an HTMLResponse.
+
+    Skips Starlette's TemplateResponse machinery (context processors,
+    media-type negotiation, background-task plumbing) — the templates don't
+    use request or url_for, so a plain render loses nothing.
+    """
+    return HTMLResponse(request.app.state.compiled[name].render(context))
 
-def create_app() -> FastAPI:
-    """Create and configure the FastAPI application."""
-    app = FastAPI(
-        title="KELP",
-        description="Key Event Log Parser - Browse KERI Key Event Logs",
-        version="1.0.0",
-    )
 
-    # Mount static files
-    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+def _is_witness_url(url: str) -> bool:
+    """Check if the OOBI URL is a witness endpoint."""
+    return url.rstrip("/").endswith("/witness")
 
-    # Templates
-    templates = Jinja2Templates(directory=TEMPLATES_DIR)
 
-    # Add custom filters to Jinja2
-    templates.env.filters["tojson_pretty"] = lambda x: json.dumps(x, indent=2)
+def _group_events_by_aid(events: list) -> dict:
+    """Group events by their AID (identifier).
 
-    # Add cache version as global variable
-    templates.env.globals["cache_version"] = _get_cache_version()
+    Index entries use each event's _idx — its position in the tab's full
+    event list, assigned once at load — so detail links resolve against
+    tab.events even when grouping a filtered subset.
+    """
+    grouped = {}
+    for i, event in enumerate(events):
+        aid = event.identifier
+        # Events without identifier (like rpy) use their type label
+        if not aid:
+            aid = _plural_label(event.type_label)
+        if aid not in grouped:
+            grouped[aid] = []
+        idx = event._idx if event._idx >= 0 else i
+        grouped[aid].append({"event": event, "index": idx})
+    return grouped
+
+
+def _build_display_and_groups(tab: TabState) -> list:
+    """Build the display list and AID groupings in one pass over tab.events.
+
+    Witness mode previously traversed the events twice — once filtering
+    the display list, once grouping by AID. One fused loop does both;
+    the groupings are stored on the tab and the display list is memoized
+    in tab._display_cache.
+    """
+    only_aid = tab.url_aid if tab.is_witness and tab.url_aid and not tab.show_all_aids else None
+    # Unfiltered display is the event list itself; no copy needed
+    display: list = [] if only_aid else tab.events
+    grouped: dict = {}
+    for i, event in enumerate(tab.events):
+        aid = event.identifier
+        # Events without identifier (like rpy) group under their type label
+        if not aid:
+            aid = _plural_label(event.type_label)
+        bucket = grouped.get(aid)
+        if bucket is None:
+            bucket = grouped[aid] = []
+        idx = event._idx if event._idx >= 0 else i
+        bucket.append({"event": event, "index": idx})
+        if only_aid is not None and event.identifier == only_aid:
+            display.append(event)
+    tab.events_by_aid_all = grouped
+    if tab.url_aid and tab.url_aid in grouped:
+        tab.events_by_aid_filtered = {tab.url_aid: grouped[tab.url_aid]}
+    else:
+        tab.events_by_aid_filtered = {}
+    tab._display_cache = display
+    return display
+
+
+def _index_tab_events(tab: TabState) -> None:
+    """Precompute the witness AID groupings once when events change.
+
+    Indices reference positions in tab.events, which is what the
+    /event/{index} endpoint expects.
+    """
+    for i, event in enumerate(tab.events):
+        event._idx = i
 
-    # In-memory state with multi-tab support
-    state = AppState()
-    # Create initial tab
-    state.create_tab()
+    by_type: dict[str, list] = defaultdict(list)
+    for event in tab.events:
+        by_type[event.type].append(event)
+    tab.events_by_type = dict(by_type)
 
-    def _is_witness_url(url: str) -> bool:
-        """Check if the OOBI URL is a witness endpoint."""
-        return url.rstrip("/").endswith("/witness")
+    _build_display_and_groups(tab)
 
-    def _group_events_by_aid(events: list, all_events: list | None = None) -> dict:
-        """Group events by their AID (identifier).
 
-        Args:
-            events: Events to group
-            all_events: If provided, indices will reference this list instead
-        """
-        # Build index lookup if we have the full list
-        index_lookup = {}
-        if all_events:
-            for i, e in enumerate(all_events):
-                index_lookup[id(e)] = i
-
-        grouped = {}
-        for i, event in enumerate(events):
-            aid = event.identifier
-            # Events without identifier (like rpy) use their type label
-            if not aid:
-                label = event.type_label
-                # Handle irregular plurals
-                if label.endswith("y"):
-                    aid = f"{label[:-1]}ies"
-                else:
-                    aid = f"{label}s"
-            if aid not in grouped:
-                grouped[aid] = []
-            # Use original index if available, otherwise use enumerated index
-            idx = index_lookup.get(id(event), i)
-            grouped[aid].append({"event": event, "index": idx})
-        return grouped
-
-    def _get_display_events(tab: TabState) -> list:
-        """Get events filtered by show_all_aids setting for a tab."""
-        events = tab.events
-        if tab.is_witness and tab.url_aid and not tab.show_all_aids:
-            events = [e for e in events if e.identifier == tab.url_aid]
-        return sorted(events, key=lambda e: e.sequence)
-
-    def _get_tab_context(tab: TabState, request: Request) -> dict:
-        """Build template context for a tab."""
-        display_events = _get_display_events(tab)
-        return {
-            "events": display_events,
-            "events_by_aid": _group_events_by_aid(display_events, tab.events) if tab.is_witness else None,
+def _grouped_for_display(tab: TabState) -> dict | None:
+    """Precomputed AID grouping matching the current display filter."""
+    if not tab.is_witness:
+        return None
+    if tab.show_all_aids or not tab.url_aid:
+        return tab.events_by_aid_all
+    return tab.events_by_aid_filtered
+
+
+def _get_display_events(tab: TabState) -> list:
+    """Get events filtered by show_all_aids setting for a tab.
+
+    Memoized on the tab until its state changes; tab.events is kept
+    sequence-sorted at load time, so the filtered view needs no resort.
+    """
+    if tab._display_cache is None:
+        _build_display_and_groups(tab)
+    return tab._display_cache
+
+
+def _get_tab_context(state: AppState, tab: TabState) -> dict:
+    """Build template context for a tab.
+
+    The tab-static subset is memoized until the tab mutates; selection
+    and app-level fields are spliced in fresh per request.
+    """
+    if tab._ctx_cache is None:
+        tab._ctx_cache = {
+            "events": _get_display_events(tab),
+            "events_by_aid": _grouped_for_display(tab),
             "is_witness": tab.is_witness,
             "show_all_aids": tab.show_all_aids,
             "url_aid": tab.url_aid,
             "source_url": tab.source_url,
             "is_upload": tab.is_upload,
-            "selected_index": tab.selected_index,
-            "selected_event": (
-                display_events[tab.selected_index]
-                if display_events and tab.selected_index < len(display_events)
-                else None
-            ),
-            "tabs": state.get_tabs_in_order(),
-            "active_tab_id": state.active_tab_id,
         }
+    display_events = tab._ctx_cache["events"]
+    return {
+        **tab._ctx_cache,
+        "selected_index": tab.selected_index,
+        "selected_event": (
+            display_events[tab.selected_index]
+            if display_events and tab.selected_index < len(display_events)
+            else None
+        ),
+        "tabs": state.get_tabs_in_order(),
+        "active_tab_id": state.active_tab_id,
+    }
+
+
+# Strong references to in-flight background close tasks — the event loop
+# only keeps weak ones, so an unreferenced task can be garbage-collected
+# before it runs
+_close_tasks: set[asyncio.Task] = set()
+
+
+def _reap_close_task(task: asyncio.Task) -> None:
+    """Drop the strong reference and retrieve the outcome of a finished close."""
+    _close_tasks.discard(task)
+    if not task.cancelled():
+        task.exception()
+
+
+async def _load_oobi_into_tab(tab: TabState, oobi_url: str) -> str | None:
+    """Load OOBI URL into a tab. Returns error message or None on success."""
+    try:
+        source = OOBISource(oobi_url)
+        events = await source.load_events()
+        # Close the client in the background — teardown (TLS shutdown,
+        # connection pool drain) doesn't need to block the response
+        close_task = asyncio.create_task(source.close())
+        _close_tasks.add(close_task)
+        close_task.add_done_callback(_reap_close_task)
+
+        tab.events = sorted(events, key=lambda e: e.sequence)
+        tab.source_url = oobi_url
+        tab.selected_index = 0
+        tab.is_witness = _is_witness_url(oobi_url)
+        tab.show_all_aids = False
+        tab.url_aid = source.identifier
+        tab.name = _tab_name_from_url(oobi_url)
+        tab.is_upload = False
+        tab.invalidate_caches()
+        _index_tab_events(tab)
+        return None
+    except OOBILoadError as e:
+        return str(e)
+    except Exception as e:
+        return str(e)
 
-    async def _load_oobi_into_tab(tab: TabState, oobi_url: str) -> str | None:
-        """Load OOBI URL into a tab. Returns error message or None on success."""
-        try:
-            source = OOBISource(oobi_url)
-            events = await source.load_events()
-            await source.close()
-
-            tab.events = sorted(events, key=lambda e: e.sequence)
-            tab.source_url = oobi_url
-            tab.selected_index = 0
-            tab.is_witness = _is_witness_url(oobi_url)
-            tab.show_all_aids = False
-            tab.url_aid = source.identifier
-            tab.name = _tab_name_from_url(oobi_url)
-            tab.is_upload = False
-            return None
-        except OOBILoadError as e:
-            return str(e)
-        except Exception as e:
-            return str(e)
-
-    @app.get("/", response_class=HTMLResponse)
-    async def index(request: Request, kel: list[str] = Query(default=[])):
-        """Render the main page.
-
-        Args:
-            kel: Optional URL-encoded OOBI URL(s) for link sharing.
-                 Can be repeated for multiple tabs (witness pool).
-        """
-        # Ensure at least one tab exists
-        if not state.tabs:
-            state.create_tab()
-
-        errors = []
-        loaded_count = 0
-
-        # Handle shared link parameter(s)
-        if kel:
-            for i, encoded_url in enumerate(kel):
-                try:
-                    decoded_url = unquote(encoded_url)
-                    # Use existing tab for first URL, create new tabs for rest
-                    if i == 0:
-                        tab = state.get_active_tab()
-                    else:
-                        tab = state.create_tab()
-
-                    error = await _load_oobi_into_tab(tab, decoded_url)
-                    if error:
-                        errors.append(f"{_tab_name_from_url(decoded_url)}: {error}")
-                    else:
-                        loaded_count += 1
-                except Exception as e:
-                    errors.append(f"Invalid URL: {e}")
-
-            # Switch back to first tab
-            if state.tab_order:
-                state.active_tab_id = state.tab_order[0]
 
-        tab = state.get_active_tab()
-        context = _get_tab_context(tab, request)
-
-        if errors:
-            context["share_error"] = "; ".join(errors)
-        if loaded_count > 0:
-            if loaded_count == 1:
-                display_events = _get_display_events(tab)
-                context["message"] = f"Loaded {len(display_events)} events from shared link"
-            else:
-                context["message"] = f"Loaded {loaded_count} tabs from shared link"
+# Endpoints live at module scope and reach app state via request.app.state,
+# so each create_app() call shares one set of handler objects instead of
+# allocating a fresh closure per endpoint, and requests resolve state with
+# attribute loads rather than closure cells.
 
-        return templates.TemplateResponse(
-            request,
-            "index.html",
-            context,
-        )
 
-    @app.post("/load", response_class=HTMLResponse)
-    async def load_oobi(request: Request, oobi_url: str = Form(...)):
-        """Load events from OOBI URL(s) into tabs.
+async def index(request: Request, kel: list[str] = Query(default=[])):
+    """Render the main page.
 
-        Supports multiple URLs separated by newlines (witness pool).
-        """
-        # Split on newlines and filter empty lines
-        urls = [u.strip() for u in oobi_url.strip().split("\n") if u.strip()]
+    Args:
+        kel: Optional URL-encoded OOBI URL(s) for link sharing.
+             Can be repeated for multiple tabs (witness pool).
+    """
+    state = request.app.state.kelp
 
-        if not urls:
-            return templates.TemplateResponse(
-                request,
-                "partials/error.html",
-                {"error": "No URLs provided"},
-            )
+    # Ensure at least one tab exists
+    if not state.tabs:
+        state.create_tab()
 
-        errors = []
-        loaded_count = 0
-        first_tab_id = None
+    errors = []
+    loaded_count = 0
 
-        for i, url in enumerate(urls):
+    # Handle shared link parameter(s)
+    if kel:
+        for i, encoded_url in enumerate(kel):
             try:
+                decoded_url = unquote(encoded_url)
                 # Use existing tab for first URL, create new tabs for rest
                 if i == 0:
                     tab = state.get_active_tab()
-                    first_tab_id = tab.id
                 else:
                     tab = state.create_tab()
 
-                error = await _load_oobi_into_tab(tab, url)
+                error = await _load_oobi_into_tab(tab, decoded_url)
                 if error:
-                    errors.append(f"{_tab_name_from_url(url)}: {error}")
+                    errors.append(f"{_tab_name_from_url(decoded_url)}: {error}")
                 else:
                     loaded_count += 1
             except Exception as e:
-                errors.append(f"{_tab_name_from_url(url)}: {e}")
+                errors.append(f"Invalid URL: {e}")
 
         # Switch back to first tab
-        if first_tab_id:
-            state.active_tab_id = first_tab_id
+        if state.tab_order:
+            state.active_tab_id = state.tab_order[0]
 
-        tab = state.get_active_tab()
-        context = _get_tab_context(tab, request)
+    tab = state.get_active_tab()
+    context = _get_tab_context(state, tab)
 
-        if errors:
-            context["error"] = "; ".join(errors)
+    if errors:
+        context["share_error"] = "; ".join(errors)
+    if loaded_count > 0:
+        if loaded_count == 1:
+            display_events = _get_display_events(tab)
+            context["message"] = f"Loaded {len(display_events)} events from shared link"
+        else:
+            context["message"] = f"Loaded {loaded_count} tabs from shared link"
 
-        if loaded_count > 0:
-            if loaded_count == 1:
-                display_events = _get_display_events(tab)
-                context["message"] = f"Loaded {len(display_events)} events"
-            else:
-                context["message"] = f"Loaded {loaded_count} tabs"
+    return _render(request, "index.html", context)
 
-        return templates.TemplateResponse(
-            request,
-            "partials/main_content_with_tab_bar.html",
-            context,
-        )
 
-    @app.post("/upload", response_class=HTMLResponse)
-    async def upload_kel(request: Request, kel_file: UploadFile = File(...)):
-        """Upload a KEL file and load events into the active tab."""
-        tab = state.get_active_tab()
+async def load_oobi(request: Request, oobi_url: str = Form(...)):
+    """Load events from OOBI URL(s) into tabs.
+
+    Supports multiple URLs separated by newlines (witness pool).
+    """
+    state = request.app.state.kelp
 
+    # Split on newlines and filter empty lines
+    urls = [u.strip() for u in oobi_url.strip().split("\n") if u.strip()]
+
+    if not urls:
+        return _render(request, "partials/error.html", {"error": "No URLs provided"})
+
+    errors = []
+    loaded_count = 0
+    first_tab_id = None
+
+    for i, url in enumerate(urls):
         try:
-            # Check file size
-            content = await kel_file.read()
-            if len(content) > MAX_UPLOAD_SIZE:
-                raise ValueError(f"File too large: {len(content)} bytes (max: {MAX_UPLOAD_SIZE})")
+            # Use existing tab for first URL, create new tabs for rest
+            if i == 0:
+                tab = state.get_active_tab()
+                first_tab_id = tab.id
+            else:
+                tab = state.create_tab()
 
-            # Parse CESR content
-            parser = CESRParser()
-            events = parser.parse(content)
+            error = await _load_oobi_into_tab(tab, url)
+            if error:
+                errors.append(f"{_tab_name_from_url(url)}: {error}")
+            else:
+                loaded_count += 1
+        except Exception as e:
+            errors.append(f"{_tab_name_from_url(url)}: {e}")
 
-            if not events:
-                raise ValueError("No events found in uploaded file")
+    # Switch back to first tab
+    if first_tab_id:
+        state.active_tab_id = first_tab_id
 
-            # Update tab state (similar to OOBI load)
-            tab.events = sorted(events, key=lambda e: e.sequence)
-            tab.source_url = f"Uploaded: {kel_file.filename}"
-            tab.selected_index = 0
-            tab.is_upload = True
+    tab = state.get_active_tab()
+    context = _get_tab_context(state, tab)
 
-            # Detect if this looks like a witness KEL (multiple AIDs)
-            unique_aids = set(e.identifier for e in events if e.identifier)
-            tab.is_witness = len(unique_aids) > 1
-            tab.show_all_aids = False
-            tab.url_aid = list(unique_aids)[0] if unique_aids else None
-            tab.name = kel_file.filename or "Uploaded KEL"
+    if errors:
+        context["error"] = "; ".join(errors)
 
+    if loaded_count > 0:
+        if loaded_count == 1:
             display_events = _get_display_events(tab)
-            context = _get_tab_context(tab, request)
-            context["message"] = f"Uploaded {len(display_events)} events from {kel_file.filename}"
-
-            return templates.TemplateResponse(
-                request,
-                "partials/main_content_with_tab_bar.html",
-                context,
-            )
-        except Exception as e:
-            return templates.TemplateResponse(
-                request,
-                "partials/error.html",
-                {"error": f"Upload failed: {str(e)}"},
-            )
-
-    @app.get("/event/{index}", response_class=HTMLResponse)
-    async def get_event(request: Request, index: int):
-        """Get event detail by index in the active tab."""
-        tab = state.get_active_tab()
-        if 0 <= index < len(tab.events):
-            tab.selected_index = index
-            event = tab.events[index]
-            return templates.TemplateResponse(
-                request,
-                "partials/event_detail.html",
-                {"event": event, "index": index},
-            )
-        return templates.TemplateResponse(
-            request,
-            "partials/error.html",
-            {"error": "Event not found"},
-        )
+            context["message"] = f"Loaded {len(display_events)} events"
+        else:
+            context["message"] = f"Loaded {loaded_count} tabs"
 
-    @app.get("/events", response_class=HTMLResponse)
-    async def get_events(
-        request: Request,
-        filter_type: str | None = None,
-        jq_filter: str | None = None,
-    ):
-        """Get filtered event list for the active tab."""
-        tab = state.get_active_tab()
-        events = _get_display_events(tab)
-        if filter_type and filter_type != "all":
-            events = [e for e in events if e.type == filter_type]
-
-        # Apply jq filter if provided
-        if jq_filter and jq_filter.strip():
-            filtered = []
-            for event in events:
-                if jq_filter_match(jq_filter, event.data):
-                    filtered.append(event)
-            events = filtered
-
-        return templates.TemplateResponse(
-            request,
-            "partials/event_list.html",
-            {
-                "events": events,
-                "events_by_aid": _group_events_by_aid(events, tab.events) if tab.is_witness else None,
-                "is_witness": tab.is_witness,
-                "show_all_aids": tab.show_all_aids,
-                "selected_index": tab.selected_index,
-                "filter_type": filter_type or "all",
-                "jq_filter": jq_filter or "",
-            },
-        )
+    return _render(request, "partials/main_content_with_tab_bar.html", context)
 
-    @app.post("/toggle-all-aids", response_class=HTMLResponse)
-    async def toggle_all_aids(request: Request):
-        """Toggle showing all AIDs for witness endpoints in the active tab."""
-        tab = state.get_active_tab()
-        tab.show_all_aids = not tab.show_all_aids
-        tab.selected_index = 0
 
-        return templates.TemplateResponse(
-            request,
-            "partials/main_content.html",
-            _get_tab_context(tab, request),
-        )
+async def upload_kel(request: Request, kel_file: UploadFile = File(...)):
+    """Upload a KEL file and load events into the active tab."""
+    state = request.app.state.kelp
+    tab = state.get_active_tab()
 
-    @app.post("/clear", response_class=HTMLResponse)
-    async def clear_events(request: Request):
-        """Clear loaded events in the active tab and return to empty state."""
-        tab = state.get_active_tab()
-        tab.events = []
-        tab.source_url = ""
+    try:
+        # Check file size
+        content = await kel_file.read()
+        if len(content) > MAX_UPLOAD_SIZE:
+            raise ValueError(f"File too large: {len(content)} bytes (max: {MAX_UPLOAD_SIZE})")
+
+        # Parse CESR content
+        parser = CESRParser()
+        events = parser.parse(content)
+
+        if not events:
+            raise ValueError("No events found in uploaded file")
+
+        # Update tab state (similar to OOBI load)
+        tab.events = sorted(events, key=lambda e: e.sequence)
+        tab.source_url = f"Uploaded: {kel_file.filename}"
         tab.selected_index = 0
-        tab.is_witness = False
+        tab.is_upload = True
+
+        # Detect if this looks like a witness KEL (multiple AIDs)
+        unique_aids = set(e.identifier for e in events if e.identifier)
+        tab.is_witness = len(unique_aids) > 1
         tab.show_all_aids = False
-        tab.url_aid = None
-        tab.name = "New Tab"
-        tab.is_upload = False
+        tab.url_aid = list(unique_aids)[0] if unique_aids else None
+        tab.name = kel_file.filename or "Uploaded KEL"
+        tab.invalidate_caches()
+        _index_tab_events(tab)
 
-        return templates.TemplateResponse(
-            request,
-            "partials/main_content_with_tab_bar.html",
-            _get_tab_context(tab, request),
-        )
+        display_events = _get_display_events(tab)
+        context = _get_tab_context(state, tab)
+        context["message"] = f"Uploaded {len(display_events)} events from {kel_file.filename}"
+
+        return _render(request, "partials/main_content_with_tab_bar.html", context)
+    except Exception as e:
+        return _render(request, "partials/error.html", {"error": f"Upload failed: {str(e)}"})
+
+
+async def get_event(request: Request, index: int):
+    """Get event detail by index in the active tab."""
+    tab = request.app.state.kelp.get_active_tab()
+    if 0 <= index < len(tab.events):
+        tab.selected_index = index
+        event = tab.events[index]
+        return _render(request, "partials/event_detail.html", {"event": event, "index": index})
+    return _render(request, "partials/error.html", {"error": "Event not found"})
+
+
+async def get_events(
+    request: Request,
+    filter_type: str | None = None,
+    jq_filter: str | None = None,
+):
+    """Get filtered event list for the active tab."""
+    tab = request.app.state.kelp.get_active_tab()
+    jq_expr = jq_filter.strip() if jq_filter else ""
+    only_aid = tab.url_aid if tab.is_witness and tab.url_aid and not tab.show_all_aids else None
+
+    if filter_type and filter_type != "all":
+        # O(matches) via the type index built at load time
+        candidates = tab.events_by_type.get(filter_type, [])
+    else:
+        # Already AID-filtered, so only the jq predicate remains
+        candidates = _get_display_events(tab)
+        only_aid = None
+
+    # Apply the remaining predicates in one pass; the compiled jq program
+    # comes from _compile_jq's cache, so per-event cost is one dict hit
+    if only_aid or jq_expr:
+        events = [
+            e
+            for e in candidates
+            if (only_aid is None or e.identifier == only_aid)
+            and (not jq_expr or jq_filter_match(jq_expr, e.data))
+        ]
+    else:
+        events = candidates
+
+    # Unfiltered views reuse the grouping precomputed at load time; only
+    # type/jq-filtered subsets need regrouping
+    if not tab.is_witness:
+        events_by_aid = None
+    elif events is _get_display_events(tab):
+        events_by_aid = _grouped_for_display(tab)
+    else:
+        events_by_aid = _group_events_by_aid(events)
+
+    return _render(
+        request,
+        "partials/event_list.html",
+        {
+            "events": events,
+            "events_by_aid": events_by_aid,
+            "is_witness": tab.is_witness,
+            "show_all_aids": tab.show_all_aids,
+            "selected_index": tab.selected_index,
+            "filter_type": filter_type or "all",
+            "jq_filter": jq_filter or "",
+        },
+    )
 
-    # Tab management endpoints
-    @app.post("/tab/new", response_class=HTMLResponse)
-    async def new_tab(request: Request):
-        """Create a new tab and make it active."""
-        tab = state.create_tab()
-        return templates.TemplateResponse(
-            request,
-            "partials/tab_content.html",
-            _get_tab_context(tab, request),
-        )
 
-    @app.get("/tab/{tab_id}", response_class=HTMLResponse)
-    async def switch_tab(request: Request, tab_id: str):
-        """Switch to an existing tab."""
-        if tab_id in state.tabs:
-            state.active_tab_id = tab_id
-        tab = state.get_active_tab()
-        return templates.TemplateResponse(
-            request,
-            "partials/tab_content.html",
-            _get_tab_context(tab, request),
-        )
+async def toggle_all_aids(request: Request):
+    """Toggle showing all AIDs for witness endpoints in the active tab."""
+    state = request.app.state.kelp
+    tab = state.get_active_tab()
+    tab.show_all_aids = not tab.show_all_aids
+    tab.selected_index = 0
+    tab.invalidate_caches()
 
-    @app.post("/tab/{tab_id}/close", response_class=HTMLResponse)
-    async def close_tab(request: Request, tab_id: str):
-        """Close a tab and switch to an adjacent one."""
-        state.close_tab(tab_id)
-        tab = state.get_active_tab()
-        return templates.TemplateResponse(
-            request,
-            "partials/tab_content.html",
-            _get_tab_context(tab, request),
-        )
+    return _render(request, "partials/main_content.html", _get_tab_context(state, tab))
 
-    @app.post("/collection/load", response_class=HTMLResponse)
-    async def load_collection(request: Request, urls: str = Form(...)):
-        """Load a collection of OOBI URLs into tabs."""
-        url_list = [u.strip() for u in urls.strip().split("\n") if u.strip()]
 
-        if not url_list:
-            tab = state.get_active_tab()
-            return templates.TemplateResponse(
-                request,
-                "partials/tab_content.html",
-                _get_tab_context(tab, request),
-            )
+async def clear_events(request: Request):
+    """Clear loaded events in the active tab and return to empty state."""
+    state = request.app.state.kelp
+    tab = state.get_active_tab()
+    tab.events = []
+    tab.source_url = ""
+    tab.selected_index = 0
+    tab.is_witness = False
+    tab.show_all_aids = False
+    tab.url_aid = None
+    tab.name = "New Tab"
+    tab.is_upload = False
+    tab.invalidate_caches()
+    _index_tab_events(tab)
 
-        errors = []
-        loaded_count = 0
-        first_tab_id = None
+    return _render(request, "partials/main_content_with_tab_bar.html", _get_tab_context(state, tab))
 
-        for i, url in enumerate(url_list):
-            try:
-                if i == 0:
-                    tab = state.get_active_tab()
-                    first_tab_id = tab.id
-                else:
-                    tab = state.create_tab()
 
-                error = await _load_oobi_into_tab(tab, url)
-                if error:
-                    errors.append(f"{_tab_name_from_url(url)}: {error}")
-                else:
-                    loaded_count += 1
-            except Exception as e:
-                errors.append(f"{_tab_name_from_url(url)}: {e}")
+# Tab management endpoints
+async def new_tab(request: Request):
+    """Create a new tab and make it active."""
+    state = request.app.state.kelp
+    tab = state.create_tab()
+    return _render(request, "partials/tab_content.html", _get_tab_context(state, tab))
+
 
-        if first_tab_id:
-            state.active_tab_id = first_tab_id
+async def switch_tab(request: Request, tab_id: str):
+    """Switch to an existing tab."""
+    state = request.app.state.kelp
+    if tab_id in state.tabs:
+        state.active_tab_id = tab_id
+    tab = state.get_active_tab()
+    return _render(request, "partials/tab_content.html", _get_tab_context(state, tab))
 
+
+async def close_tab(request: Request, tab_id: str):
+    """Close a tab and switch to an adjacent one."""
+    state = request.app.state.kelp
+    state.close_tab(tab_id)
+    tab = state.get_active_tab()
+    return _render(request, "partials/tab_content.html", _get_tab_context(state, tab))
+
+
+async def load_collection(request: Request, urls: str = Form(...)):
+    """Load a collection of OOBI URLs into tabs."""
+    state = request.app.state.kelp
+    url_list = [u.strip() for u in urls.strip().split("\n") if u.strip()]
+
+    if not url_list:
         tab = state.get_active_tab()
-        context = _get_tab_context(tab, request)
+        return _render(request, "partials/tab_content.html", _get_tab_context(state, tab))
+
+    errors = []
+    loaded_count = 0
+    first_tab_id = None
+
+    for i, url in enumerate(url_list):
+        try:
+            if i == 0:
+                tab = state.get_active_tab()
+                first_tab_id = tab.id
+            else:
+                tab = state.create_tab()
+
+            error = await _load_oobi_into_tab(tab, url)
+            if error:
+                errors.append(f"{_tab_name_from_url(url)}: {error}")
+            else:
+                loaded_count += 1
+        except Exception as e:
+            errors.append(f"{_tab_name_from_url(url)}: {e}")
 
-        if errors:
-            context["error"] = "; ".join(errors)
-        if loaded_count > 0:
-            context["message"] = f"Loaded {loaded_count} tab{'s' if loaded_count > 1 else ''} from collection"
+    if first_tab_id:
+        state.active_tab_id = first_tab_id
 
-        return templates.TemplateResponse(
-            request,
-            "partials/tab_content.html",
-            context,
+    tab = state.get_active_tab()
+    context = _get_tab_context(state, tab)
+
+    if errors:
+        context["error"] = "; ".join(errors)
+    if loaded_count > 0:
+        context["message"] = (
+            f"Loaded {loaded_count} tab{'s' if loaded_count > 1 else ''} from collection"
         )
 
+    return _render(request, "partials/tab_content.html", context)
+
+
+# Route table shared by every app instance: (path, handler, HTTP method)
+_ROUTES = (
+    ("/", index, "GET"),
+    ("/load", load_oobi, "POST"),
+    ("/upload", upload_kel, "POST"),
+    ("/event/{index}", get_event, "GET"),
+    ("/events", get_events, "GET"),
+    ("/toggle-all-aids", toggle_all_aids, "POST"),
+    ("/clear", clear_events, "POST"),
+    ("/tab/new", new_tab, "POST"),
+    ("/tab/{tab_id}", switch_tab, "GET"),
+    ("/tab/{tab_id}/close", close_tab, "POST"),
+    ("/collection/load", load_collection, "POST"),
+)
+
+
+def create_app() -> FastAPI:
+    """Create and configure the FastAPI application."""
+    # Use uvloop's libuv event loop when available (ships with
+    # uvicorn[standard]); per-callback dispatch overhead is a real share of
+    # the latency for small HTMX partial responses
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
+    app = FastAPI(
+        title="KELP",
+        description="Key Event Log Parser - Browse KERI Key Event Logs",
+        version="1.0.0",
+    )
+
+    # Event-list and main-content partials are large, repetitive HTML that
+    # compresses ~5-10x; tiny responses stay uncompressed
+    app.add_middleware(GZipMiddleware, minimum_size=500)
+
+    # Mount static files
+    app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
+    # Templates — compiled code objects are cached for the process lifetime;
+    # templates only change on deploy, so skip the per-request source re-check
+    # and persist compiled bytecode across restarts
+    templates = Jinja2Templates(directory=TEMPLATES_DIR)
+    templates.env.auto_reload = False
+    templates.env.cache_size = 400
+    templates.env.bytecode_cache = jinja2.FileSystemBytecodeCache()
+
+    # Add custom filters to Jinja2
+    templates.env.filters["tojson_pretty"] = lambda x: orjson.dumps(
+        x, option=orjson.OPT_INDENT_2
+    ).decode()
+
+    # Add cache version as global variable
+    templates.env.globals["cache_version"] = _get_cache_version()
+
+    # Compiled Template objects, resolved once at startup; _render pulls
+    # these off app.state per request. Also pre-warms the compile cache.
+    app.state.templates = templates
+    app.state.compiled = {name: templates.env.get_template(name) for name in TEMPLATE_NAMES}
+
+    # In-memory state with multi-tab support
+    app.state.kelp = AppState()
+    # Create initial tab
+    app.state.kelp.create_tab()
+
+    for path, handler, method in _ROUTES:
+        app.add_api_route(path, handler, methods=[method], response_class=HTMLResponse)
+
     return app
 
 